@@ -1,3 +1,4 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 
 # Here's the reason that all the other Python files are in ../python/dendro/api_helpers
@@ -16,11 +17,19 @@ from dendro.api_helpers.routers.processor.router import router as processor_rout
 from dendro.api_helpers.routers.compute_resource.router import router as compute_resource_router
 from dendro.api_helpers.routers.client.router import router as client_router
 from dendro.api_helpers.routers.gui.router import router as gui_router
+from dendro.api_helpers.clients._get_mongo_client import _mongo_client_scope
 
 from fastapi.middleware.cors import CORSMiddleware
 
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # share a single mongo client (and connection pool) across all requests
+    async with _mongo_client_scope():
+        yield
+
+
+app = FastAPI(lifespan=lifespan)
 
 # Set up CORS
 origins = [
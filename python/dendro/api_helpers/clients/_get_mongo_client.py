@@ -1,41 +1,123 @@
-from typing import Union, TYPE_CHECKING
+from typing import Union, Optional, Set, Tuple, TYPE_CHECKING
 import asyncio
+import functools
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from ..core.settings import get_settings
 from .MockMongoClient import MockMongoClient
 from ...mock import using_mock
 
 if TYPE_CHECKING:
-    from motor.motor_asyncio import AsyncIOMotorClient # pragma: no cover
+    from pymongo import AsyncMongoClient # pragma: no cover
 
 
+class MongoClientLoopError(Exception):
+    pass
+
 _globals = {
-    'mock_mongo_client': None
+    'mock_mongo_client': None,
+    'mongo_client': None,
+    'mongo_client_loop': None
 }
 
-def _get_mongo_client() -> Union['AsyncIOMotorClient', MockMongoClient]:
-    # We want one async mongo client per event loop
-    loop = asyncio.get_event_loop()
-    if hasattr(loop, '_mongo_client'):
-        return loop._mongo_client # type: ignore
+# The client (together with the event loop it is bound to) for the current
+# async context. This is seeded once in the app lifespan (see
+# _mongo_client_scope) so that all the tasks spawned from there share a single
+# connection pool.
+_mongo_client_cv: ContextVar[Optional[Tuple[Union['AsyncMongoClient', MockMongoClient], asyncio.AbstractEventLoop]]] = ContextVar('mongo_client', default=None)
+
+def _get_mongo_client() -> Union['AsyncMongoClient', MockMongoClient]:
+    loop = asyncio.get_running_loop()
+    entry = _mongo_client_cv.get()
+    if entry is not None:
+        client, client_loop = entry
+        if client_loop is not loop:
+            # reusing a client across loops would silently fragment the connection pool
+            raise MongoClientLoopError('The mongo client is being used from an event loop other than the one it was created on')
+        return client
+
+    # Not within a _mongo_client_scope (e.g., when testing), so fall back to
+    # one client per process. An async mongo client is bound to the event loop
+    # it was created on, so we need to create a new one if the loop has changed.
+    client = _globals['mongo_client'] # type: ignore
+    if client is None or _globals['mongo_client_loop'] is not loop:
+        old_client = client
+        old_client_loop = _globals['mongo_client_loop']
+        client = _create_mongo_client()
+        _globals['mongo_client'] = client # type: ignore
+        _globals['mongo_client_loop'] = loop # type: ignore
+        if old_client is not None and old_client is not client:
+            _close_replaced_mongo_client(old_client, old_client_loop) # type: ignore
+
+    return client
+
+@asynccontextmanager
+async def _mongo_client_scope():
+    """Create a mongo client that is shared by everything running within this context"""
+    loop = asyncio.get_running_loop()
+    client = _create_mongo_client()
+    # also use it as the process-wide fallback, since depending on the server
+    # the request handlers do not necessarily inherit the lifespan context
+    old_client = _globals['mongo_client']
+    old_client_loop = _globals['mongo_client_loop']
+    _globals['mongo_client'] = client # type: ignore
+    _globals['mongo_client_loop'] = loop # type: ignore
+    if old_client is not None and old_client is not client:
+        _close_replaced_mongo_client(old_client, old_client_loop) # type: ignore
+    token = _mongo_client_cv.set((client, loop))
+    try:
+        yield
+    finally:
+        _mongo_client_cv.reset(token)
+        if _globals['mongo_client'] is client:
+            _globals['mongo_client'] = None
+            _globals['mongo_client_loop'] = None
+        if not isinstance(client, MockMongoClient):
+            await client.close()
 
-    mongo_uri = get_settings().MONGO_URI
+@functools.cache
+def _mongo_uri() -> Optional[str]:
+    # the MONGO_URI does not change over the lifetime of the process
+    return get_settings().MONGO_URI
 
+def _create_mongo_client() -> Union['AsyncMongoClient', MockMongoClient]:
     # If we're using a mock client, return it
+    # (using_mock() is not cached because it can be toggled at runtime by the tests)
     if using_mock():
         client = _globals['mock_mongo_client'] # type: ignore
         if client is None:
             client = MockMongoClient()
             _globals['mock_mongo_client'] = client # type: ignore
+        return client
     else: # pragma: no cover
         # Otherwise, create a new client
+        mongo_uri = _mongo_uri()
         assert mongo_uri is not None, 'MONGO_URI environment variable not set'
-        from motor.motor_asyncio import AsyncIOMotorClient
-        client = AsyncIOMotorClient(mongo_uri)
+        from pymongo import AsyncMongoClient
+        return AsyncMongoClient(mongo_uri, maxPoolSize=100, tz_aware=False)
 
-    # Store the client on the event loop
-    setattr(loop, '_mongo_client', client)
+# so that the tasks closing the replaced clients are not garbage collected
+_close_tasks: Set[asyncio.Task] = set()
 
-    return client
+def _close_replaced_mongo_client(client: Union['AsyncMongoClient', MockMongoClient], client_loop: asyncio.AbstractEventLoop):
+    """Close a client that is no longer used, so that its connection pool and monitor tasks do not leak"""
+    if isinstance(client, MockMongoClient):
+        return
+    if client_loop.is_running():
+        # the loop is running in another thread
+        asyncio.run_coroutine_threadsafe(client.close(), client_loop)
+        return
+    # The loop it was created on is no longer running, so close it from this one
+    task = asyncio.get_running_loop().create_task(_close_mongo_client_quietly(client))
+    _close_tasks.add(task)
+    task.add_done_callback(_close_tasks.discard)
+
+async def _close_mongo_client_quietly(client: 'AsyncMongoClient'):
+    try:
+        await client.close()
+    except Exception as e: # pylint: disable=broad-except
+        # the connections may already have been torn down along with their loop
+        print(f'Warning: problem closing replaced mongo client: {e}')
 
 def _clear_mock_mongo_databases():
     client: MockMongoClient = _globals['mock_mongo_client'] # type: ignore
@@ -1,8 +1,15 @@
 import os
+import threading
 from typing import Optional
 import requests
 from ._crypto_keys import _sign_message_str
 
+try:
+    # orjson is considerably faster than the standard library for parsing responses (e.g., long lists of jobs)
+    import orjson
+except ImportError:
+    orjson = None # type: ignore
+
 dendro_url = os.getenv('DENDRO_URL', 'https://dendro.vercel.app')
 
 _globals = {
@@ -11,6 +18,23 @@ _globals = {
 def _use_api_test_client(test_client):
     _globals['test_client'] = test_client
 
+# requests.Session is not thread-safe, and the compute resource makes api
+# requests from several worker threads at once, so each thread gets its own
+_thread_local = threading.local()
+
+def _get_session() -> requests.Session:
+    # Reuse the session so that connections to the API are kept alive between requests
+    session = getattr(_thread_local, 'session', None)
+    if session is None:
+        session = requests.Session()
+        _thread_local.session = session
+    return session
+
+def _parse_json_response(resp):
+    if orjson is not None:
+        return orjson.loads(resp.content)
+    return resp.json()
+
 def _compute_resource_get_api_request(*,
     url_path: str,
     compute_resource_id: str,
@@ -41,7 +65,7 @@ def _compute_resource_get_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -52,7 +76,7 @@ def _compute_resource_get_api_request(*,
     except Exception as e:
         print(f'Error in compute resource get api request for {url}; {e}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 # not used right now
 # def _compute_resource_post_api_request(*,
@@ -73,7 +97,7 @@ def _compute_resource_get_api_request(*,
 #     test_client = _globals['test_client']
 #     if test_client is None:
 #         url = f'{dendro_url}{url_path}'
-#         client = requests
+#         client = _get_session()
 #     else:
 #         assert url_path.startswith('/api')
 #         url = url_path
@@ -84,7 +108,7 @@ def _compute_resource_get_api_request(*,
 #     except Exception as e:
 #         print(f'Error in compute resource post api request for {url}; {e}')
 #         raise
-#     return resp.json()
+#     return _parse_json_response(resp)
 
 def _compute_resource_put_api_request(*,
     url_path: str,
@@ -104,7 +128,7 @@ def _compute_resource_put_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -115,7 +139,7 @@ def _compute_resource_put_api_request(*,
     except Exception as e:
         print(f'Error in compute resource put api request for {url}; {e}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 def _processor_get_api_request(*,
     url_path: str,
@@ -124,7 +148,7 @@ def _processor_get_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -135,7 +159,7 @@ def _processor_get_api_request(*,
     except Exception as e:
         print(f'Error in processor get api request for {url}; {e}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 def _processor_put_api_request(*,
     url_path: str,
@@ -145,7 +169,7 @@ def _processor_put_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -156,7 +180,7 @@ def _processor_put_api_request(*,
     except Exception as e:
         print(f'Error in processor put api request for {url}; {e}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 def _client_get_api_request(*,
     url_path: str
@@ -164,7 +188,7 @@ def _client_get_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -175,7 +199,7 @@ def _client_get_api_request(*,
     except Exception as e:
         print(f'Error in client get api request for {url}; {e}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 ####################################################################################################
 # The GUI API requests below are only here for use with pytest since the real GUI requests come from the browser using typescript
@@ -190,7 +214,7 @@ def _gui_get_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -201,7 +225,7 @@ def _gui_get_api_request(*,
     except: # noqa E722
         print(f'Error in gui get api request for {url}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 def _gui_post_api_request(*,
     url_path: str,
@@ -214,7 +238,7 @@ def _gui_post_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -225,7 +249,7 @@ def _gui_post_api_request(*,
     except: # noqa E722
         print(f'Error in gui post api request for {url}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 def _gui_put_api_request(*,
     url_path: str,
@@ -238,7 +262,7 @@ def _gui_put_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -249,7 +273,7 @@ def _gui_put_api_request(*,
     except: # noqa E722
         print(f'Error in gui put api request for {url}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
 
 def _gui_delete_api_request(*,
     url_path: str,
@@ -261,7 +285,7 @@ def _gui_delete_api_request(*,
     test_client = _globals['test_client']
     if test_client is None:
         url = f'{dendro_url}{url_path}'
-        client = requests
+        client = _get_session()
     else:
         assert url_path.startswith('/api')
         url = url_path
@@ -272,4 +296,4 @@ def _gui_delete_api_request(*,
     except: # noqa E722
         print(f'Error in gui delete api request for {url}')
         raise
-    return resp.json()
+    return _parse_json_response(resp)
@@ -1,17 +1,26 @@
-from typing import List
-import queue
+from typing import Callable, Optional
 from pubnub.pnconfiguration import PNConfiguration
 from pubnub.callbacks import SubscribeCallback
 from pubnub.pubnub import PubNub
 
+# the message types that mean the compute resource should check for jobs
+_job_message_types = ('newPendingJob', 'jobStatusChanged')
+
 class MySubscribeCallback(SubscribeCallback):
-    def __init__(self, message_queue: queue.Queue, compute_resource_id: str):
-        self._message_queue = message_queue
+    def __init__(self, compute_resource_id: str):
         self._compute_resource_id = compute_resource_id
+        self._on_job_message: Optional[Callable[[], None]] = None
+    def set_on_job_message(self, on_job_message: Callable[[], None]):
+        self._on_job_message = on_job_message
     def message(self, pubnub, message):
         msg = message.message
-        if msg.get('computeResourceId', None) == self._compute_resource_id:
-            self._message_queue.put(msg)
+        if msg.get('computeResourceId', None) != self._compute_resource_id:
+            return
+        if msg.get('type', None) not in _job_message_types:
+            return
+        if self._on_job_message is not None:
+            # note: this is called from the pubnub thread
+            self._on_job_message()
 
 class PubsubClient:
     def __init__(self, *,
@@ -20,19 +29,13 @@ class PubsubClient:
         pubnub_user: str,
         compute_resource_id: str
     ):
-        self._message_queue = queue.Queue()
         pnconfig = PNConfiguration()
         pnconfig.subscribe_key = pubnub_subscribe_key # type: ignore (not sure why we need to type ignore this)
         pnconfig.user_id = pubnub_user
         pubnub = PubNub(pnconfig)
-        pubnub.add_listener(MySubscribeCallback(message_queue=self._message_queue, compute_resource_id=compute_resource_id))
+        self._callback = MySubscribeCallback(compute_resource_id=compute_resource_id)
+        pubnub.add_listener(self._callback)
         pubnub.subscribe().channels([pubnub_channel]).execute()
-    def take_messages(self) -> List[dict]:
-        ret = []
-        while True:
-            try:
-                msg = self._message_queue.get(block=False)
-                ret.append(msg)
-            except queue.Empty:
-                break
-        return ret
+    def set_on_job_message(self, on_job_message: Callable[[], None]):
+        """Set a function to be called (from the pubnub thread) whenever a message about new or updated jobs is received"""
+        self._callback.set_on_job_message(on_job_message)
@@ -1,6 +1,7 @@
 from typing import List
 import os
 import time
+import threading
 import subprocess
 
 from ..mock import using_mock
@@ -15,14 +16,20 @@ class SlurmJobHandler:
         self._jobs: List[DendroJob] = []
         self._job_ids = set()
         self._time_of_last_job_added = 0
+        # jobs are added from the event loop thread, but do_work is called from a worker thread
+        self._lock = threading.Lock()
     def add_job(self, job: DendroJob):
         job_id = job.jobId
-        if job_id not in self._job_ids:
-            self._jobs.append(job)
-            self._job_ids.add(job_id)
-            self._time_of_last_job_added = time.time()
+        with self._lock:
+            if job_id not in self._job_ids:
+                self._jobs.append(job)
+                self._job_ids.add(job_id)
+                self._time_of_last_job_added = time.time()
+    def is_idle(self) -> bool:
+        """Whether there are no queued jobs waiting to be submitted"""
+        return len(self._jobs) == 0
     def do_work(self):
-        if len(self._jobs) == 0:
+        if self.is_idle():
             return
 
         time_scale_factor = 1 if not using_mock() else 10000
@@ -33,12 +40,13 @@ class SlurmJobHandler:
             return
 
         max_jobs_in_batch = 20
-        num_jobs_to_start = min(max_jobs_in_batch, len(self._jobs))
-        if num_jobs_to_start > 0:
+        with self._lock:
+            num_jobs_to_start = min(max_jobs_in_batch, len(self._jobs))
             jobs_to_start = self._jobs[:num_jobs_to_start]
             self._jobs = self._jobs[num_jobs_to_start:]
             for job in jobs_to_start:
                 self._job_ids.remove(job.jobId)
+        if num_jobs_to_start > 0:
             self._run_slurm_batch(jobs_to_start)
     def _run_slurm_batch(self, jobs: List[DendroJob]):
         if not os.path.exists('slurm_scripts'):
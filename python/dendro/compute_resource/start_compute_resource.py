@@ -1,10 +1,14 @@
-from typing import List, Dict, Optional, Union
+from typing import List, Dict, Optional, Set, Union
 import os
+import asyncio
+import threading
+import logging
+import heapq
+from collections import OrderedDict
 import yaml
 import time
 from pathlib import Path
 import shutil
-import multiprocessing
 from ..common._api_request import _compute_resource_get_api_request, _compute_resource_put_api_request
 from .register_compute_resource import env_var_keys
 from ..sdk.App import App
@@ -14,40 +18,79 @@ from ..common.dendro_types import DendroComputeResourceApp, DendroJob
 from ..mock import using_mock
 
 
+logger = logging.getLogger(__name__)
+
 max_simultaneous_local_jobs = 2
+max_simultaneous_app_loads = 8
+max_num_attempted_to_start_job_ids = 10000
+
+try:
+    # pydantic v2: compile the validator for a list of jobs once and reuse it
+    from pydantic import TypeAdapter
+    _jobs_adapter = TypeAdapter(List[DendroJob])
+except ImportError:
+    # pydantic v1
+    _jobs_adapter = None
 
 class ComputeResourceException(Exception):
     pass
 
 class Daemon:
     def __init__(self):
-        self._compute_resource_id = os.getenv('COMPUTE_RESOURCE_ID', None)
-        self._compute_resource_private_key = os.getenv('COMPUTE_RESOURCE_PRIVATE_KEY', None)
+        compute_resource_id = os.getenv('COMPUTE_RESOURCE_ID', None)
+        compute_resource_private_key = os.getenv('COMPUTE_RESOURCE_PRIVATE_KEY', None)
         self._node_id = os.getenv('NODE_ID', None)
         self._node_name = os.getenv('NODE_NAME', None)
-        if self._compute_resource_id is None:
+        if compute_resource_id is None:
             raise ValueError('Compute resource has not been initialized in this directory, and the environment variable COMPUTE_RESOURCE_ID is not set.')
-        if self._compute_resource_private_key is None:
+        if compute_resource_private_key is None:
             raise ValueError('Compute resource has not been initialized in this directory, and the environment variable COMPUTE_RESOURCE_PRIVATE_KEY is not set.')
-        self._apps: List[App] = _load_apps(
+        self._compute_resource_id: str = compute_resource_id
+        self._compute_resource_private_key: str = compute_resource_private_key
+
+        # important to keep track of which jobs we attempted to start
+        # so that we don't attempt multiple times in the case where starting failed
+        # (this is bounded, because the daemon may run for weeks, and old jobs will have long since left the unfinished list)
+        self._attempted_to_start_job_ids: 'OrderedDict[str, None]' = OrderedDict()
+        # jobs are started in worker threads (local and aws batch jobs from _handle_jobs, slurm jobs from _slurm_periodic)
+        self._attempted_to_start_job_ids_lock = threading.Lock()
+
+    async def initialize(self):
+        """Load the apps, report the compute resource spec, and subscribe to pubsub. This must be called before start()."""
+        self._apps: List[App] = await _load_apps(
             compute_resource_id=self._compute_resource_id,
             compute_resource_private_key=self._compute_resource_private_key,
             compute_resource_node_name=self._node_name,
             compute_resource_node_id=self._node_id
         )
 
-        # important to keep track of which jobs we attempted to start
-        # so that we don't attempt multiple times in the case where starting failed
-        self._attempted_to_start_job_ids = set()
-
         print(f'Loaded apps: {", ".join([app._name for app in self._apps])}')
 
+        # the app and the resource type ('local', 'aws_batch' or 'slurm') for each processor, so that these are single lookups
+        self._app_by_processor: Dict[str, App] = {}
+        self._resource_type_by_processor: Dict[str, str] = {}
+        for app in self._apps:
+            resource_type = _get_app_resource_type(app)
+            for processor in app._processors:
+                # if more than one app has the same processor, the first one wins
+                if processor._name not in self._app_by_processor:
+                    self._app_by_processor[processor._name] = app
+                    self._resource_type_by_processor[processor._name] = resource_type
+
         from .SlurmJobHandler import SlurmJobHandler # we don't want a circular import
         self._slurm_job_handlers_by_processor: Dict[str, SlurmJobHandler] = {}
+        # processors with the same slurm opts share a handler, so that their jobs can be batched together
+        slurm_job_handlers_by_opts_id: Dict[int, SlurmJobHandler] = {}
         for app in self._apps:
+            if app._slurm_opts is None:
+                continue
+            opts_id = id(app._slurm_opts)
+            if opts_id not in slurm_job_handlers_by_opts_id:
+                slurm_job_handlers_by_opts_id[opts_id] = SlurmJobHandler(self, app._slurm_opts)
             for processor in app._processors:
-                if app._slurm_opts is not None:
-                    self._slurm_job_handlers_by_processor[processor._name] = SlurmJobHandler(self, app._slurm_opts)
+                self._slurm_job_handlers_by_processor[processor._name] = slurm_job_handlers_by_opts_id[opts_id]
+        # each distinct handler only once, for polling
+        self._unique_slurm_job_handlers: List[SlurmJobHandler] = list(slurm_job_handlers_by_opts_id.values())
 
         spec_apps = []
         for app in self._apps:
@@ -59,7 +102,8 @@ class Daemon:
         spec = {
             'apps': spec_apps
         }
-        _compute_resource_put_api_request(
+        await asyncio.to_thread(
+            _compute_resource_put_api_request,
             url_path=url_path,
             compute_resource_id=self._compute_resource_id,
             compute_resource_private_key=self._compute_resource_private_key,
@@ -68,7 +112,8 @@ class Daemon:
             }
         )
         print('Getting pubsub info')
-        pubsub_subscription = get_pubsub_subscription(
+        pubsub_subscription = await asyncio.to_thread(
+            get_pubsub_subscription,
             compute_resource_id=self._compute_resource_id,
             compute_resource_private_key=self._compute_resource_private_key,
             compute_resource_node_name=self._node_name,
@@ -85,79 +130,131 @@ class Daemon:
         else:
             self._pubsub_client = None
 
-    def start(self, *, timeout: Optional[float] = None, cleanup_old_jobs=True): # timeout is used for testing
+    async def start(self, *, timeout: Optional[float] = None, cleanup_old_jobs=True): # timeout is used for testing
         timer_handle_jobs = 0
 
         time_scale_factor = 1 if not using_mock() else 10000
+        periodic_handle_jobs_interval = (60 * 10) / time_scale_factor # normally we will get pubsub messages for updates, but if we don't, we should check every 10 minutes
+
+        # The pubsub client receives messages on its own thread, and wakes us up when there is news about jobs
+        # (a burst of messages just sets the event repeatedly, resulting in a single call to _handle_jobs)
+        loop = asyncio.get_running_loop()
+        self._wake_event = asyncio.Event()
+        if self._pubsub_client is not None:
+            def on_job_message():
+                loop.call_soon_threadsafe(self._wake_event.set)
+            self._pubsub_client.set_on_job_message(on_job_message)
+
+        # Background tasks (we need to hold strong references so they don't get garbage collected)
+        self._background_tasks: Set[asyncio.Task] = set()
 
         # Start cleaning up old job directories
-        # It's important to do this in a separate process
+        # The deletion happens in a worker thread
         # because it can take a long time to delete all the files in the tmp directories (remfile is the culprit)
-        # and we don't want to block the main process from handling jobs
+        # and we don't want to block the event loop from handling jobs
         if cleanup_old_jobs:
-            multiprocessing.Process(target=_cleanup_old_job_working_directories, args=(os.getcwd() + '/jobs',)).start()
+            self._start_background_task(_cleanup_old_job_working_directories(os.getcwd() + '/jobs'))
+
+        # (the handlers are fixed at construction, so without any there is nothing to poll)
+        if self._unique_slurm_job_handlers:
+            self._start_background_task(self._slurm_periodic(time_scale_factor=time_scale_factor))
 
         print('Starting compute resource')
         overall_timer = time.time()
-        while True:
-            elapsed_handle_jobs = time.time() - timer_handle_jobs
-            need_to_handle_jobs = elapsed_handle_jobs > (60 * 10) / time_scale_factor # normally we will get pubsub messages for updates, but if we don't, we should check every 10 minutes
-            messages = self._pubsub_client.take_messages() if self._pubsub_client is not None else []
-            for msg in messages:
-                if msg['type'] == 'newPendingJob':
-                    need_to_handle_jobs = True
-                if msg['type'] == 'jobStatusChaged':
+        need_to_handle_jobs = True
+        try:
+            while True:
+                elapsed_handle_jobs = time.time() - timer_handle_jobs
+                if need_to_handle_jobs or elapsed_handle_jobs > periodic_handle_jobs_interval:
+                    timer_handle_jobs = time.time()
+                    await self._handle_jobs()
+
+                overall_elapsed = time.time() - overall_timer
+                if timeout is not None and overall_elapsed > timeout:
+                    print(f'Compute resource timed out after {timeout} seconds')
+                    return
+
+                # Wait until we get a pubsub message, or until it's time for the periodic check
+                wait_time = max(0, periodic_handle_jobs_interval - (time.time() - timer_handle_jobs))
+                if timeout is not None:
+                    wait_time = min(wait_time, max(0, timeout - overall_elapsed))
+                try:
+                    await asyncio.wait_for(self._wake_event.wait(), timeout=wait_time)
                     need_to_handle_jobs = True
-            if need_to_handle_jobs:
-                timer_handle_jobs = time.time()
-                self._handle_jobs()
-
-            for slurm_job_handler in self._slurm_job_handlers_by_processor.values():
-                slurm_job_handler.do_work()
-
-            overall_elapsed = time.time() - overall_timer
-            if timeout is not None and overall_elapsed > timeout:
-                print(f'Compute resource timed out after {timeout} seconds')
-                return
-            if overall_elapsed < 5 / time_scale_factor:
-                time.sleep(0.01 / time_scale_factor) # for the first few seconds we can sleep for a short time (useful for testing)
-            else:
-                time.sleep(2 / time_scale_factor)
-
-    def _handle_jobs(self):
+                except asyncio.TimeoutError:
+                    need_to_handle_jobs = False
+                # clear before handling the jobs so that messages arriving in the meantime are not lost
+                self._wake_event.clear()
+        finally:
+            tasks = list(self._background_tasks)
+            for task in tasks:
+                task.cancel()
+            # wait for the cancellations to take effect so that no task outlives this call
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _start_background_task(self, coro):
+        task = asyncio.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    async def _slurm_periodic(self, *, time_scale_factor: float):
+        # The slurm job handlers wait a bit before submitting a batch, so they need to be polled
+        while True:
+            for slurm_job_handler in self._unique_slurm_job_handlers:
+                if not slurm_job_handler.is_idle():
+                    try:
+                        # this makes api requests (via _start_job), so it is done in a worker thread
+                        await asyncio.to_thread(slurm_job_handler.do_work)
+                    except Exception: # pylint: disable=broad-except
+                        # don't let one failed batch stop the polling (an uncaught exception would end this task silently)
+                        logger.exception('Error in slurm job handler')
+            await asyncio.sleep(2 / time_scale_factor)
+
+    async def _handle_jobs(self):
         url_path = f'/api/compute_resource/compute_resources/{self._compute_resource_id}/unfinished_jobs'
         if not self._compute_resource_id:
             return
         if not self._compute_resource_private_key:
             return
-        resp = _compute_resource_get_api_request(
+        # the request is done in a worker thread so that the event loop is not blocked
+        resp = await asyncio.to_thread(
+            _compute_resource_get_api_request,
             url_path=url_path,
             compute_resource_id=self._compute_resource_id,
             compute_resource_private_key=self._compute_resource_private_key,
             compute_resource_node_name=self._node_name,
             compute_resource_node_id=self._node_id
         )
-        jobs = resp['jobs']
-        jobs = [DendroJob(**job) for job in jobs] # validation
+        jobs = _validate_jobs(resp['jobs'])
+
+        # Sort the jobs by resource type in a single pass
+        local_jobs: List[DendroJob] = []
+        aws_batch_jobs: List[DendroJob] = []
+        slurm_jobs: List[DendroJob] = []
+        for job in jobs:
+            resource_type = self._get_job_resource_type(job)
+            if resource_type == 'local':
+                local_jobs.append(job)
+            elif resource_type == 'aws_batch':
+                aws_batch_jobs.append(job)
+            elif resource_type == 'slurm':
+                if self._job_is_pending(job):
+                    slurm_jobs.append(job)
 
         # Local jobs
-        local_jobs = [job for job in jobs if self._is_local_job(job)]
         num_non_pending_local_jobs = len([job for job in local_jobs if job.status != 'pending'])
         if num_non_pending_local_jobs < max_simultaneous_local_jobs:
             pending_local_jobs = [job for job in local_jobs if job.status == 'pending']
-            pending_local_jobs = _sort_jobs_by_timestamp_created(pending_local_jobs)
             num_to_start = min(max_simultaneous_local_jobs - num_non_pending_local_jobs, len(pending_local_jobs))
-            local_jobs_to_start = pending_local_jobs[:num_to_start]
+            local_jobs_to_start = _oldest_jobs(pending_local_jobs, num_to_start)
             for job in local_jobs_to_start:
-                self._start_job(job)
+                await asyncio.to_thread(self._start_job, job)
 
         # AWS Batch jobs
-        aws_batch_jobs = [job for job in jobs if self._is_aws_batch_job(job)]
         for job in aws_batch_jobs:
-            self._start_job(job)
+            await asyncio.to_thread(self._start_job, job)
 
         # SLURM jobs
-        slurm_jobs = [job for job in jobs if self._is_slurm_job(job) and self._job_is_pending(job)]
         for job in slurm_jobs:
             processor_name = job.processorName
             if processor_name not in self._slurm_job_handlers_by_processor:
@@ -165,33 +262,20 @@ class Daemon:
             self._slurm_job_handlers_by_processor[processor_name].add_job(job)
 
     def _get_job_resource_type(self, job: DendroJob) -> Union[str, None]:
-        processor_name = job.processorName
-        app: Union[App, None] = self._find_app_with_processor(processor_name)
-        if app is None:
-            return None
-        if app._aws_batch_job_queue is not None:
-            return 'aws_batch'
-        if app._slurm_opts is not None:
-            return 'slurm'
-        return 'local'
-
-    def _is_local_job(self, job: DendroJob) -> bool:
-        return self._get_job_resource_type(job) == 'local'
-
-    def _is_aws_batch_job(self, job: DendroJob) -> bool:
-        return self._get_job_resource_type(job) == 'aws_batch'
-
-    def _is_slurm_job(self, job: DendroJob) -> bool:
-        return self._get_job_resource_type(job) == 'slurm'
+        return self._resource_type_by_processor.get(job.processorName, None)
 
     def _job_is_pending(self, job: DendroJob) -> bool:
         return job.status == 'pending'
 
     def _start_job(self, job: DendroJob, run_process: bool = True, return_shell_command: bool = False):
+        """Start a job. This makes blocking api requests, so it should be called from a worker thread."""
         job_id = job.jobId
-        if job_id in self._attempted_to_start_job_ids:
-            return '' # see above comment about why this is necessary
-        self._attempted_to_start_job_ids.add(job_id)
+        with self._attempted_to_start_job_ids_lock:
+            if job_id in self._attempted_to_start_job_ids:
+                return '' # see above comment about why this is necessary
+            self._attempted_to_start_job_ids[job_id] = None
+            if len(self._attempted_to_start_job_ids) > max_num_attempted_to_start_job_ids:
+                self._attempted_to_start_job_ids.popitem(last=False)
         job_private_key = job.jobPrivateKey
         processor_name = job.processorName
         app = self._find_app_with_processor(processor_name)
@@ -212,24 +296,25 @@ class Daemon:
                 return_shell_command=return_shell_command
             )
         except Exception as e: # pylint: disable=broad-except
-            # do a traceback
-            import traceback
-            traceback.print_exc()
+            logger.exception('Failed to start job %s', job_id)
             msg = f'Failed to start job: {str(e)}'
-            print(msg)
             _set_job_status(job_id=job_id, job_private_key=job_private_key, status='failed', error=msg)
             return ''
 
     def _find_app_with_processor(self, processor_name: str) -> Union[App, None]:
-        for app in self._apps:
-            for p in app._processors:
-                if p._name == processor_name:
-                    return app
-        return None
+        return self._app_by_processor.get(processor_name, None)
+
+def _get_app_resource_type(app: App) -> str:
+    if app._aws_batch_job_queue is not None:
+        return 'aws_batch'
+    if app._slurm_opts is not None:
+        return 'slurm'
+    return 'local'
 
-def _load_apps(*, compute_resource_id: str, compute_resource_private_key: str, compute_resource_node_name: Optional[str] = None, compute_resource_node_id: Optional[str] = None) -> List[App]:
+async def _load_apps(*, compute_resource_id: str, compute_resource_private_key: str, compute_resource_node_name: Optional[str] = None, compute_resource_node_id: Optional[str] = None) -> List[App]:
     url_path = f'/api/compute_resource/compute_resources/{compute_resource_id}/apps'
-    resp = _compute_resource_get_api_request(
+    resp = await asyncio.to_thread(
+        _compute_resource_get_api_request,
         url_path=url_path,
         compute_resource_id=compute_resource_id,
         compute_resource_private_key=compute_resource_private_key,
@@ -246,53 +331,64 @@ def _load_apps(*, compute_resource_id: str, compute_resource_private_key: str, c
     compute_resource_apps = resp['apps']
     compute_resource_apps = [DendroComputeResourceApp(**app) for app in compute_resource_apps]
 
-    return _load_apps_from_compute_resource_apps(compute_resource_apps)
-
-def _load_apps_from_compute_resource_apps(compute_resource_apps: List[DendroComputeResourceApp]) -> List[App]:
-    ret = []
-    for a in compute_resource_apps:
-        container = a.container
-        aws_batch_opts = a.awsBatch
-        slurm_opts = a.slurm
-        s = []
-        if container is not None:
-            s.append(f'container: {container}')
-        if aws_batch_opts is not None:
-            if slurm_opts is not None:
-                raise ComputeResourceException('App has awsBatch opts but also has slurm opts')
-            aws_batch_job_queue = aws_batch_opts.jobQueue
-            aws_batch_job_definition = aws_batch_opts.jobDefinition
-            s.append(f'awsBatchJobQueue: {aws_batch_job_queue}')
-            s.append(f'awsBatchJobDefinition: {aws_batch_job_definition}')
-        else:
-            aws_batch_job_queue = None
-            aws_batch_job_definition = None
+    return await _load_apps_from_compute_resource_apps(compute_resource_apps)
+
+async def _load_apps_from_compute_resource_apps(compute_resource_apps: List[DendroComputeResourceApp]) -> List[App]:
+    # The specs are loaded independently (usually over the network), so we load them in parallel,
+    # but limit the number of simultaneous requests so we don't hammer the server hosting the specs
+    semaphore = asyncio.Semaphore(max_simultaneous_app_loads)
+
+    async def load_app(a: DendroComputeResourceApp) -> App:
+        async with semaphore:
+            return await asyncio.to_thread(_load_app_from_compute_resource_app, a)
+
+    return list(await asyncio.gather(*[load_app(a) for a in compute_resource_apps]))
+
+def _load_app_from_compute_resource_app(a: DendroComputeResourceApp) -> App:
+    container = a.container
+    aws_batch_opts = a.awsBatch
+    slurm_opts = a.slurm
+    s = []
+    if container is not None:
+        s.append(f'container: {container}')
+    if aws_batch_opts is not None:
         if slurm_opts is not None:
-            slurm_cpus_per_task = slurm_opts.cpusPerTask
-            slurm_partition = slurm_opts.partition
-            slurm_time = slurm_opts.time
-            slurm_other_opts = slurm_opts.otherOpts
-            s.append(f'slurmCpusPerTask: {slurm_cpus_per_task}')
-            s.append(f'slurmPartition: {slurm_partition}')
-            s.append(f'slurmTime: {slurm_time}')
-            s.append(f'slurmOtherOpts: {slurm_other_opts}')
-        else:
-            slurm_cpus_per_task = None
-            slurm_partition = None
-            slurm_time = None
-            slurm_other_opts = None
-        print(f'Loading app {a.specUri} | {" | ".join(s)}')
-        app = App.from_spec_uri(
-            spec_uri=a.specUri,
-            aws_batch_job_queue=aws_batch_job_queue,
-            aws_batch_job_definition=aws_batch_job_definition,
-            slurm_opts=slurm_opts
-        )
-        print(f'  {len(app._processors)} processors')
-        ret.append(app)
-    return ret
+            raise ComputeResourceException('App has awsBatch opts but also has slurm opts')
+        aws_batch_job_queue = aws_batch_opts.jobQueue
+        aws_batch_job_definition = aws_batch_opts.jobDefinition
+        s.append(f'awsBatchJobQueue: {aws_batch_job_queue}')
+        s.append(f'awsBatchJobDefinition: {aws_batch_job_definition}')
+    else:
+        aws_batch_job_queue = None
+        aws_batch_job_definition = None
+    if slurm_opts is not None:
+        slurm_cpus_per_task = slurm_opts.cpusPerTask
+        slurm_partition = slurm_opts.partition
+        slurm_time = slurm_opts.time
+        slurm_other_opts = slurm_opts.otherOpts
+        s.append(f'slurmCpusPerTask: {slurm_cpus_per_task}')
+        s.append(f'slurmPartition: {slurm_partition}')
+        s.append(f'slurmTime: {slurm_time}')
+        s.append(f'slurmOtherOpts: {slurm_other_opts}')
+    else:
+        slurm_cpus_per_task = None
+        slurm_partition = None
+        slurm_time = None
+        slurm_other_opts = None
+    print(f'Loading app {a.specUri} | {" | ".join(s)}')
+    app = App.from_spec_uri(
+        spec_uri=a.specUri,
+        aws_batch_job_queue=aws_batch_job_queue,
+        aws_batch_job_definition=aws_batch_job_definition,
+        slurm_opts=slurm_opts
+    )
+    print(f'Loaded app {a.specUri} | {len(app._processors)} processors') # apps are loaded in parallel, so we need to say which one
+    return app
 
 def start_compute_resource(dir: str, *, timeout: Optional[float] = None, cleanup_old_jobs=True): # timeout is used for testing
+    asyncio.run(start_compute_resource_async(dir=dir, timeout=timeout, cleanup_old_jobs=cleanup_old_jobs))
+
+async def start_compute_resource_async(dir: str, *, timeout: Optional[float] = None, cleanup_old_jobs=True): # timeout is used for testing
     config_fname = os.path.join(dir, '.dendro-compute-resource-node.yaml')
     if os.path.exists(config_fname):
         with open(config_fname, 'r', encoding='utf8') as f:
@@ -303,7 +399,8 @@ def start_compute_resource(dir: str, *, timeout: Optional[float] = None, cleanup
         if k in the_config:
             os.environ[k] = the_config[k]
     daemon = Daemon()
-    daemon.start(timeout=timeout, cleanup_old_jobs=cleanup_old_jobs)
+    await daemon.initialize()
+    await daemon.start(timeout=timeout, cleanup_old_jobs=cleanup_old_jobs)
 
 def get_pubsub_subscription(*, compute_resource_id: str, compute_resource_private_key: str, compute_resource_node_name: Optional[str] = None, compute_resource_node_id: Optional[str] = None):
     url_path = f'/api/compute_resource/compute_resources/{compute_resource_id}/pubsub_subscription'
@@ -316,19 +413,43 @@ def get_pubsub_subscription(*, compute_resource_id: str, compute_resource_privat
     )
     return resp['subscription']
 
-def _sort_jobs_by_timestamp_created(jobs: List[DendroJob]) -> List[DendroJob]:
-    return sorted(jobs, key=lambda job: job.timestampCreated)
+def _validate_jobs(jobs: List[dict]) -> List[DendroJob]:
+    if _jobs_adapter is not None:
+        return _jobs_adapter.validate_python(jobs)
+    return [DendroJob(**job) for job in jobs]
+
+def _oldest_jobs(jobs: List[DendroJob], n: int) -> List[DendroJob]:
+    # we only need the first few, so no need to sort the whole list
+    return heapq.nsmallest(n, jobs, key=lambda job: job.timestampCreated)
 
-def _cleanup_old_job_working_directories(dir: str):
+async def _cleanup_old_job_working_directories(dir: str):
     """Delete working dirs that are more than 24 hours old"""
     jobs_dir = Path(dir)
     while True:
-        if not jobs_dir.exists():
-            continue
-        for job_dir in jobs_dir.iterdir():
-            if job_dir.is_dir():
-                elapsed = time.time() - job_dir.stat().st_mtime
+        # errors are logged rather than raised, because an uncaught exception would silently end this task
+        try:
+            old_job_dirs = await asyncio.to_thread(_find_old_job_working_directories, jobs_dir)
+        except Exception: # pylint: disable=broad-except
+            logger.exception('Error scanning %s for old working dirs', jobs_dir)
+            old_job_dirs = []
+        for job_dir in old_job_dirs:
+            print(f'Removing old working dir {job_dir}')
+            try:
+                await asyncio.to_thread(shutil.rmtree, job_dir)
+            except Exception: # pylint: disable=broad-except
+                logger.exception('Error removing old working dir %s', job_dir)
+        await asyncio.sleep(60)
+
+def _find_old_job_working_directories(jobs_dir: Path) -> List[Path]:
+    if not jobs_dir.exists():
+        return []
+    ret: List[Path] = []
+    now = time.time()
+    # scandir entries cache the results of is_dir() and stat(), which saves syscalls
+    with os.scandir(jobs_dir) as entries:
+        for entry in entries:
+            if entry.is_dir():
+                elapsed = now - entry.stat().st_mtime
                 if elapsed > 24 * 60 * 60:
-                    print(f'Removing old working dir {job_dir}')
-                    shutil.rmtree(job_dir)
-        time.sleep(60)
+                    ret.append(Path(entry.path))
+    return ret
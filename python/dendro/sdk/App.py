@@ -1,9 +1,12 @@
-from typing import List, Union, Type, get_type_hints
+from typing import List, Dict, Union, Type, get_type_hints
 import os
+import re
 import json
+import functools
 import shutil
 import tempfile
 from .InputFile import InputFile
+from .OutputFile import OutputFile
 from .AppProcessor import AppProcessor
 from .Job import Job
 from ._run_job import _run_job
@@ -11,6 +14,19 @@ from ..common.dendro_types import ComputeResourceSlurmOpts
 from ._load_spec_from_uri import _load_spec_from_uri
 from .ProcessorBase import ProcessorBase
 
+try:
+    # pydantic v2
+    from pydantic import TypeAdapter
+except ImportError:
+    # pydantic v1
+    TypeAdapter = None # type: ignore
+
+try:
+    # orjson is much faster than the standard library for reading contexts
+    import orjson
+except ImportError:
+    orjson = None # type: ignore
+
 
 class DendroAppException(Exception):
     pass
@@ -42,9 +58,11 @@ class App:
         self._app_image = app_image
         self._app_executable = app_executable
         self._processors: List[AppProcessor] = []
+        self._processors_by_name: Dict[str, AppProcessor] = {}
         self._aws_batch_job_queue: Union[str, None] = None
         self._aws_batch_job_definition: Union[str, None] = None
         self._slurm_opts: Union[ComputeResourceSlurmOpts, None] = None
+        self._spec_cache: Union[dict, None] = None # invalidated whenever a processor is added
 
     def add_processor(self, processor_class: Type[ProcessorBase]):
         """Add a processor to the app
@@ -53,22 +71,28 @@ class App:
             processor_class (Type[ProcessorBase]): The processor class for the processor
         """
         P = AppProcessor.from_processor_class(processor_class)
-        self._processors.append(P)
+        self._add_app_processor(P)
+
+    def _add_app_processor(self, processor: AppProcessor):
+        self._processors.append(processor)
+        # if there are multiple processors with the same name, the first one takes precedence
+        self._processors_by_name.setdefault(processor._name, processor)
+        self._spec_cache = None
 
     def run(self):
         """This function should be called once in main.py"""
-        SPEC_OUTPUT_FILE = os.environ.get('SPEC_OUTPUT_FILE', None)
+        env = os.environ # a local reference, so the lookups below don't each go through the os module
+        SPEC_OUTPUT_FILE = env.get('SPEC_OUTPUT_FILE', None)
+        JOB_ID = env.get('JOB_ID', None)
         if SPEC_OUTPUT_FILE is not None:
-            if os.environ.get('JOB_ID', None) is not None:
+            if JOB_ID is not None:
                 raise Exception('Cannot set both JOB_ID and SPEC_OUTPUT_FILE')
-            with open(SPEC_OUTPUT_FILE, 'w') as f:
-                json.dump(self.get_spec(), f, indent=4)
+            _write_spec_file(self.get_spec(), SPEC_OUTPUT_FILE)
             return
-        JOB_ID = os.environ.get('JOB_ID', None)
         if JOB_ID is not None:
-            JOB_PRIVATE_KEY = os.environ.get('JOB_PRIVATE_KEY', None)
-            JOB_INTERNAL = os.environ.get('JOB_INTERNAL', None)
-            APP_EXECUTABLE = os.environ.get('APP_EXECUTABLE', None)
+            JOB_PRIVATE_KEY = env.get('JOB_PRIVATE_KEY', None)
+            JOB_INTERNAL = env.get('JOB_INTERNAL', None)
+            APP_EXECUTABLE = env.get('APP_EXECUTABLE', None)
             if JOB_PRIVATE_KEY is None:
                 raise KeyError('JOB_PRIVATE_KEY is not set')
             if JOB_INTERNAL == '1':
@@ -84,42 +108,38 @@ class App:
                 job_private_key=JOB_PRIVATE_KEY,
                 app_executable=APP_EXECUTABLE
             )
-        TEST_APP_PROCESSOR = os.environ.get('TEST_APP_PROCESSOR', None)
+        TEST_APP_PROCESSOR = env.get('TEST_APP_PROCESSOR', None)
         if TEST_APP_PROCESSOR is not None:
-            PROCESSOR_NAME = os.environ.get('PROCESSOR_NAME', None)
-            CONTEXT_FILE = os.environ.get('CONTEXT_FILE', None)
+            PROCESSOR_NAME = env.get('PROCESSOR_NAME', None)
+            CONTEXT_FILE = env.get('CONTEXT_FILE', None)
             if PROCESSOR_NAME is None:
                 raise KeyError('PROCESSOR_NAME is not set')
             if CONTEXT_FILE is None:
                 raise KeyError('CONTEXT_FILE is not set')
-            if CONTEXT_FILE.endswith('.json'):
-                with open(CONTEXT_FILE, 'r') as f:
-                    context = json.load(f)
-            elif CONTEXT_FILE.endswith('.yml') or CONTEXT_FILE.endswith('.yaml'):
-                import yaml
-                with open(CONTEXT_FILE, 'r') as f:
-                    context = yaml.safe_load(f)
-            else:
+            load_context_file = _context_file_loaders.get(os.path.splitext(CONTEXT_FILE)[1].lower(), None)
+            if load_context_file is None:
                 raise Exception(f'Unrecognized file extension: {CONTEXT_FILE}')
-            processor = next((p for p in self._processors if p._name == PROCESSOR_NAME), None)
+            context = load_context_file(CONTEXT_FILE)
+            processor = self._processors_by_name.get(PROCESSOR_NAME, None)
             if not processor:
                 raise Exception(f'Processor not found: {PROCESSOR_NAME}')
             processor_class = processor._processor_class
             assert processor_class, f'Processor does not have a processor_class: {PROCESSOR_NAME}'
             context_type = _get_type_of_context_in_processor_class(processor_class)
             assert context_type, f'Processor does not have a context type: {PROCESSOR_NAME}'
-            context = context_type(**context)
+            context = _validate_context(context_type, context)
             processor_class.run(context)
             return
         raise KeyError('You must set JOB_ID as an environment variable to run a job')
 
     def make_spec_file(self, spec_output_file: str = 'spec.json'):
         """Create a spec.json file. This is called internally."""
-        with open(spec_output_file, 'w', encoding='utf-8') as f:
-            json.dump(self.get_spec(), f, indent=4)
+        _write_spec_file(self.get_spec(), spec_output_file)
 
     def get_spec(self):
         """Get the spec for this app. This is called internally."""
+        if self._spec_cache is not None:
+            return self._spec_cache
         processors = []
         for processor in self._processors:
             processors.append(
@@ -133,6 +153,7 @@ class App:
             'executable': self._app_executable,
             'processors': processors
         }
+        self._spec_cache = spec
         return spec
 
     @staticmethod
@@ -146,7 +167,7 @@ class App:
         )
         for processor_spec in spec['processors']:
             processor = AppProcessor.from_spec(processor_spec)
-            app._processors.append(processor)
+            app._add_app_processor(processor)
         return app
 
     @staticmethod
@@ -174,39 +195,38 @@ class App:
 
         # Find the registered processor and the associated processor function
         processor_name = job.processor_name
-        processor = next((p for p in self._processors if p._name == processor_name), None)
+        processor = self._processors_by_name.get(processor_name, None)
         assert processor, f'Processor not found: {processor_name}'
         if not processor._processor_class:
             raise Exception(f'Processor does not have a processor_class: {processor_name}')
         processor_class = processor._processor_class
 
+        # Index the job inputs/outputs/parameters by name so we don't need to scan them for every lookup
+        # (inputs without a name could not be matched to a processor input anyway)
+        job_inputs_by_name: Dict[str, InputFile] = {i.name: i for i in job.inputs if i.name is not None}
+        job_outputs_by_name = {o.name: o for o in job.outputs}
+        job_parameters_by_name = {p.name: p for p in job.parameters}
+
         # Assemble the context for the processor function
         context = ContextObject()
         for input in processor._inputs:
             if not input.list:
                 # this input is not a list
-                input_file = next((i for i in job.inputs if i.name == input.name), None)
+                input_file = job_inputs_by_name.get(input.name, None)
                 assert input_file, f'Input not found: {input.name}'
                 setattr(context, input.name, input_file)
             else:
                 # this input is a list
-                the_list: List[InputFile] = []
-                ii = 0
-                while True:
-                    # find a job input of the form <input_name>[ii]
-                    input_file = next((i for i in job.inputs if i.name == f'{input.name}[{ii}]'), None)
-                    if input_file is None:
-                        # if not found, we must be at the end of the list
-                        break
-                    the_list.append(input_file)
-                    ii += 1
+                the_list = _get_list_input_files(job_inputs_by_name, input.name)
                 setattr(context, input.name, the_list)
+        output_files_to_verify: List[OutputFile] = []
         for output in processor._outputs:
-            output_file = next((o for o in job.outputs if o.name == output.name), None)
+            output_file = job_outputs_by_name.get(output.name, None)
             assert output_file is not None, f'Output not found: {output.name}'
             setattr(context, output.name, output_file)
+            output_files_to_verify.append(output_file)
         for parameter in processor._parameters:
-            job_parameter = next((p for p in job.parameters if p.name == parameter.name), None)
+            job_parameter = job_parameters_by_name.get(parameter.name, None)
             parameter_value = parameter.default if job_parameter is None else job_parameter.value
             _setattr_where_name_may_have_dots(context, parameter.name, parameter_value)
 
@@ -214,10 +234,8 @@ class App:
         processor_class.run(context)
 
         # Check that all outputs were set
-        for output in processor._outputs:
-            output_file = next((o for o in job.outputs if o.name == output.name), None)
-            assert output_file is not None, f'Output not found: {output.name}'
-            assert output_file.was_uploaded, f'Output was not uploaded: {output.name}'
+        for output_file in output_files_to_verify:
+            assert output_file.was_uploaded, f'Output was not uploaded: {output_file.name}'
 
 # An empty object that we can set attributes on
 class ContextObject:
@@ -242,6 +260,67 @@ def _get_job(*, job_id: str, job_private_key: str) -> Job:
     )
     return job
 
+def _write_spec_file(spec: dict, spec_output_file: str):
+    # The standard library is used even when orjson is available (this is not a
+    # hot path), so that the output does not depend on which is installed
+    with open(spec_output_file, 'w', encoding='utf-8') as f:
+        json.dump(spec, f, indent=4)
+
+def _json_loads(content: Union[str, bytes]):
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # e.g., NaN or Infinity, which json.dump writes (for float parameter defaults) but orjson rejects
+            pass
+    return json.loads(content)
+
+def _get_list_input_files(job_inputs_by_name: Dict[str, InputFile], input_name: str) -> List[InputFile]:
+    """Collect the job inputs of the form <input_name>[ii] in a single pass"""
+    pattern = re.compile(re.escape(input_name) + r'\[(0|[1-9][0-9]*)\]')
+    input_files_by_index: Dict[int, InputFile] = {}
+    for name, input_file in job_inputs_by_name.items():
+        m = pattern.fullmatch(name)
+        if m is not None:
+            input_files_by_index[int(m.group(1))] = input_file
+    # the list ends at the first missing index
+    the_list: List[InputFile] = []
+    while len(the_list) in input_files_by_index:
+        the_list.append(input_files_by_index[len(the_list)])
+    return the_list
+
+@functools.cache
+def _get_context_type_adapter(context_type):
+    # the compiled validator is reused for every context of this type
+    assert TypeAdapter is not None, 'TypeAdapter requires pydantic v2'
+    return TypeAdapter(context_type)
+
+def _validate_context(context_type, context: dict):
+    if TypeAdapter is None:
+        # pydantic v1
+        return context_type(**context)
+    return _get_context_type_adapter(context_type).validate_python(context)
+
+@functools.cache
+def _yaml():
+    # yaml is only needed for yaml context files, so import it lazily
+    import yaml
+    return yaml
+
+def _load_json_context_file(fname: str):
+    with open(fname, 'rb') as f:
+        return _json_loads(f.read())
+
+def _load_yaml_context_file(fname: str):
+    with open(fname, 'r') as f:
+        return _yaml().safe_load(f)
+
+_context_file_loaders = {
+    '.json': _load_json_context_file,
+    '.yml': _load_yaml_context_file,
+    '.yaml': _load_yaml_context_file
+}
+
 def _setattr_where_name_may_have_dots(obj, name, value):
     """Set an attribute on an object, where the name may have dots in it"""
     if '.' not in name:
@@ -249,11 +328,15 @@ def _setattr_where_name_may_have_dots(obj, name, value):
         return
     parts = name.split('.')
     for part in parts[:-1]:
-        if not hasattr(obj, part):
-            setattr(obj, part, ContextObject())
-        obj = getattr(obj, part)
+        # a single getattr per level rather than hasattr followed by getattr
+        sub_obj = getattr(obj, part, None)
+        if sub_obj is None:
+            sub_obj = ContextObject()
+            setattr(obj, part, sub_obj)
+        obj = sub_obj
     setattr(obj, parts[-1], value)
 
+@functools.cache
 def _get_type_of_context_in_processor_class(processor_class):
     # Retrieve the 'run' method from the processor class
     run_method = getattr(processor_class, 'run', None)
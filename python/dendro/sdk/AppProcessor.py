@@ -1,5 +1,8 @@
 from typing import Any, List, Union, Dict, Type
 from dataclasses import dataclass
+import dataclasses
+import sys
+import functools
 import inspect
 from .. import BaseModel
 from pydantic_core import PydanticUndefined
@@ -7,20 +10,25 @@ from .ProcessorBase import ProcessorBase
 from .InputFile import InputFile
 from .OutputFile import OutputFile
 
-@dataclass
+# Use __slots__ for the dataclasses below where supported (python >= 3.10)
+_dataclass_kwargs: Dict[str, Any] = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**_dataclass_kwargs)
 class AppProcessorInput:
     """An input file of a processor in an app"""
     name: str
     description: str
     list: bool
-    def get_spec(self):
-        ret: Dict[str, Any] = {
+    _spec: Dict[str, Any] = dataclasses.field(init=False, repr=False, compare=False) # built once in __post_init__
+    def __post_init__(self):
+        self._spec = {
             'name': self.name,
             'description': self.description
         }
         if self.list:
-            ret['list'] = True
-        return ret
+            self._spec['list'] = True
+    def get_spec(self):
+        return self._spec
     @staticmethod
     def from_spec(spec):
         return AppProcessorInput(
@@ -29,16 +37,19 @@ class AppProcessorInput:
             list=spec.get('list', False)
         )
 
-@dataclass
+@dataclass(**_dataclass_kwargs)
 class AppProcessorOutput:
     """An output file of a processor in an app"""
     name: str
     description: str
-    def get_spec(self):
-        return {
+    _spec: Dict[str, Any] = dataclasses.field(init=False, repr=False, compare=False) # built once in __post_init__
+    def __post_init__(self):
+        self._spec = {
             'name': self.name,
             'description': self.description
         }
+    def get_spec(self):
+        return self._spec
     @staticmethod
     def from_spec(spec):
         return AppProcessorOutput(
@@ -46,7 +57,7 @@ class AppProcessorOutput:
             description=spec['description']
         )
 
-@dataclass
+@dataclass(**_dataclass_kwargs)
 class AppProcessorParameter:
     """A parameter of a processor in an app"""
     name: str
@@ -61,7 +72,9 @@ class AppProcessorParameter:
             'description': self.description,
             'type': _type_to_string(self.type)
         }
-        if self.default != PydanticUndefined:
+        # PydanticUndefined is a sentinel meaning "no default", so compare by identity
+        # (this also avoids invoking __ne__ on arbitrary default values)
+        if self.default is not PydanticUndefined:
             ret['default'] = self.default
         if self.options is not None:
             ret['options'] = self.options
@@ -82,16 +95,19 @@ class AppProcessorParameter:
             secret=secret
         )
 
-@dataclass
+@dataclass(**_dataclass_kwargs)
 class AppProcessorAttribute:
     """An attribute of a processor in an app"""
     name: str
     value: str
-    def get_spec(self):
-        return {
+    _spec: Dict[str, Any] = dataclasses.field(init=False, repr=False, compare=False) # built once in __post_init__
+    def __post_init__(self):
+        self._spec = {
             'name': self.name,
             'value': self.value
         }
+    def get_spec(self):
+        return self._spec
     @staticmethod
     def from_spec(spec):
         return AppProcessorAttribute(
@@ -99,14 +115,17 @@ class AppProcessorAttribute:
             value=spec['value']
         )
 
-@dataclass
+@dataclass(**_dataclass_kwargs)
 class AppProcessorTag:
     """A tag of a processor in an app"""
     tag: str
-    def get_spec(self):
-        return {
+    _spec: Dict[str, Any] = dataclasses.field(init=False, repr=False, compare=False) # built once in __post_init__
+    def __post_init__(self):
+        self._spec = {
             'tag': self.tag
         }
+    def get_spec(self):
+        return self._spec
     @staticmethod
     def from_spec(spec):
         return AppProcessorTag(
@@ -118,6 +137,18 @@ class AppProcessorException(Exception):
 
 class AppProcessor:
     """A processor in an app"""
+    __slots__ = (
+        '_name',
+        '_description',
+        '_label',
+        '_inputs',
+        '_outputs',
+        '_parameters',
+        '_attributes',
+        '_tags',
+        '_processor_class',
+        '_spec_cache'
+    )
     def __init__(self, *,
         name: str,
         description: str,
@@ -138,7 +169,13 @@ class AppProcessor:
         self._attributes = attributes
         self._tags = tags
         self._processor_class = processor_class
+        self._spec_cache: Union[Dict[str, Any], None] = None
     def get_spec(self):
+        # processors are not modified after construction, so the spec only needs to be computed once
+        if self._spec_cache is None:
+            self._spec_cache = self._compute_spec()
+        return self._spec_cache
+    def _compute_spec(self):
         return {
             'name': self._name,
             'description': self._description,
@@ -197,15 +234,31 @@ class AppProcessor:
         )
 
 def _get_context_inputs_outputs_parameters_for_processor(processor_class: Type[ProcessorBase]):
-    run_signature = inspect.signature(processor_class.run)
-    run_parameters = run_signature.parameters
-    if len(run_parameters) != 1:
-        raise Exception('The run method should have exactly one parameter')
-    context_param = list(run_parameters.values())[0]
+    # Note: the result is not cached because the returned inputs/outputs/parameters are mutable
+    return _get_context_inputs_outputs_parameters_for_model(_get_context_class_for_processor(processor_class))
 
-    return _get_context_inputs_outputs_parameters_for_model(context_param.annotation)
+@functools.cache
+def _get_context_class_for_processor(processor_class: Type[ProcessorBase]) -> Type[BaseModel]:
+    # Read the code object directly rather than using inspect.signature, which is comparatively expensive
+    run_method = processor_class.run
+    run_function = getattr(run_method, '__func__', run_method) # in case run is a classmethod
+    code = run_function.__code__
+    param_names = code.co_varnames[:code.co_argcount + code.co_kwonlyargcount]
+    if inspect.ismethod(run_method):
+        param_names = param_names[1:] # skip the bound cls argument
+    has_var_args = bool(code.co_flags & (inspect.CO_VARARGS | inspect.CO_VARKEYWORDS))
+    if len(param_names) != 1 or has_var_args:
+        raise Exception('The run method should have exactly one parameter')
+    annotation = run_function.__annotations__.get(param_names[0], None)
+    if isinstance(annotation, str):
+        # forward reference (e.g., from __future__ import annotations)
+        from typing import get_type_hints
+        annotation = get_type_hints(run_function).get(param_names[0], None)
+    if annotation is None:
+        raise Exception(f'The parameter of the run method of {processor_class.__name__} needs a type annotation (the context class)')
+    return annotation
 
-def _get_context_inputs_outputs_parameters_for_model(context_class: Type[BaseModel]):
+def _get_context_fields_for_model(context_class: Type[BaseModel]):
     context_fields = []
     try:
         # This works in pydantic v2
@@ -242,19 +295,31 @@ def _get_context_inputs_outputs_parameters_for_model(context_class: Type[BaseMod
             'options': options,
             'secret': secret,
         })
+    return context_fields
 
+def _get_context_inputs_outputs_parameters_for_model(context_class: Type[BaseModel]):
     inputs: List[AppProcessorInput] = []
     outputs: List[AppProcessorOutput] = []
     parameters: List[AppProcessorParameter] = []
-    for context_field in context_fields:
-        name: str = context_field['name']
+    # Depth-first walk over the fields of the (possibly nested) models. The
+    # fields of a nested model are processed in place of the field holding it,
+    # and are named with the dotted prefix of their parent fields.
+    stack = [(iter(_get_context_fields_for_model(context_class)), '')]
+    while stack:
+        fields_iter, prefix = stack[-1]
+        context_field = next(fields_iter, None)
+        if context_field is None:
+            stack.pop()
+            continue
+        name: str = prefix + context_field['name']
         description: str = context_field['description']
         annotation: Any = context_field['annotation']
         default: Any = context_field['default']
         secret: Union[bool, None] = context_field['secret']
         options: Union[List[str], None] = context_field['options']
-        if annotation == InputFile or annotation == List[InputFile]:
-            is_list = annotation == List[InputFile]
+        kind = _get_field_kind(annotation)
+        if kind == 'input' or kind == 'input_list':
+            is_list = kind == 'input_list'
             inputs.append(AppProcessorInput(
                 name=name,
                 description=description,
@@ -267,7 +332,7 @@ def _get_context_inputs_outputs_parameters_for_model(context_class: Type[BaseMod
                 raise AppProcessorException(f"Input {name} has secret set - only parameters can have secret set")
             if default is not PydanticUndefined and default is not None: # None case only necessary for pydantic v1
                 raise AppProcessorException(f"Input {name} has default set - only parameters can have default set")
-        elif annotation == OutputFile:
+        elif kind == 'output':
             outputs.append(AppProcessorOutput(
                 name=name,
                 description=description
@@ -289,22 +354,28 @@ def _get_context_inputs_outputs_parameters_for_model(context_class: Type[BaseMod
                 secret=secret if secret is not None else False
             ))
         elif _is_pydantic_model_class(annotation):
-            inputs0, outputs0, parameters0 = _get_context_inputs_outputs_parameters_for_model(annotation)
-            for input0 in inputs0:
-                input0.name = f'{name}.{input0.name}'
-                inputs.append(input0)
-            for output0 in outputs0:
-                output0.name = f'{name}.{output0.name}'
-                outputs.append(output0)
-            for parameter0 in parameters0:
-                parameter0.name = f'{name}.{parameter0.name}'
-                parameters.append(parameter0)
+            stack.append((iter(_get_context_fields_for_model(annotation)), f'{name}.'))
         else:
             raise AppProcessorException(f"Unsupported type for {name}: {annotation}")
     return inputs, outputs, parameters
 
+# Dispatch on the annotation object itself rather than comparing against each of these in turn
+_field_kind_by_annotation = {
+    InputFile: 'input',
+    List[InputFile]: 'input_list',
+    OutputFile: 'output'
+}
+
+def _get_field_kind(annotation: Any) -> Union[str, None]:
+    try:
+        return _field_kind_by_annotation.get(annotation, None)
+    except TypeError:
+        # not hashable
+        return None
+
 def _is_pydantic_model_class(type: Any):
-    return inspect.isclass(type) and issubclass(type, BaseModel)
+    # checking the mro directly is cheaper than issubclass, which goes through the ABC machinery
+    return inspect.isclass(type) and BaseModel in type.__mro__
 
 _type_map = {
     'str': str,
@@ -319,11 +390,15 @@ _type_map = {
     'Optional[float]': Union[float, None],
 }
 
+# reverse lookups, so that we don't need to scan _type_map
+_type_to_string_map = {v: k for k, v in _type_map.items()}
+_valid_parameter_types = frozenset(_type_map.values())
+
 def _type_to_string(type: Any):
-    for key, value in _type_map.items():
-        if value == type:
-            return key
-    raise ValueError(f'Unexpected type: {type}')
+    try:
+        return _type_to_string_map[type]
+    except (KeyError, TypeError) as exc: # TypeError if the type is not hashable
+        raise ValueError(f'Unexpected type: {type}') from exc
 
 def _type_from_string(type: str):
     try:
@@ -332,10 +407,19 @@ def _type_from_string(type: str):
         raise ValueError(f'Unexpected type: {type}') from exc
 
 def _is_valid_parameter_type(type: Any):
-    return type in _type_map.values()
+    try:
+        return type in _valid_parameter_types
+    except TypeError:
+        # not hashable, so certainly not one of the valid types
+        return False
 
 def _get_annotation_for_field_using_python_type_hints(model_class: Type[BaseModel], field_name: str):
     # This is a workaround for pydantic v1 where field.annotation is not set and field.type_ doesn't cut it for List[InputFile] when pydantic version is < 1.10.0
-    from typing import get_type_hints
-    type_hints = get_type_hints(model_class)
+    type_hints = _get_type_hints_for_model_class(model_class)
     return type_hints.get(field_name, None)
+
+@functools.cache
+def _get_type_hints_for_model_class(model_class: Type[BaseModel]):
+    # get_type_hints is expensive and would otherwise be called for every field of the model
+    from typing import get_type_hints
+    return get_type_hints(model_class)
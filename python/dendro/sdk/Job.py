@@ -1,5 +1,6 @@
 from typing import Any, List, Dict
 import time
+from functools import cached_property
 from dataclasses import dataclass
 from .InputFile import InputFile
 from .OutputFile import OutputFile
@@ -24,12 +25,7 @@ class Job:
     ) -> None:
         self._job_id = job_id
         self._job_private_key = job_private_key
-        resp = _job_info_manager.get_job_info(job_id=job_id, job_private_key=job_private_key)
-        # important to set these only once here because these objects will be passed into the processor function
-        self._inputs = [InputFile(name=i.name, job_id=self._job_id, job_private_key=self._job_private_key) for i in resp.inputs]
-        self._outputs = [OutputFile(name=o.name, job_id=self._job_id, job_private_key=self._job_private_key) for o in resp.outputs]
-        self._parameters = [JobParameter(name=p.name, value=p.value) for p in resp.parameters]
-        self._processor_name = resp.processorName
+        # the job info is only fetched from the API when it is first needed
     @property
     def job_id(self) -> str:
         """The ID of the job"""
@@ -37,20 +33,22 @@ class Job:
     @property
     def processor_name(self) -> str:
         """The name of the processor"""
-        resp = _job_info_manager.get_job_info(job_id=self._job_id, job_private_key=self._job_private_key)
-        return resp.processorName
-    @property
+        return self._get_job_info().processorName
+    # important to construct these only once (and then cache them) because these objects will be passed into the processor function
+    @cached_property
     def inputs(self) -> List[InputFile]:
         """The input files of the job"""
-        return self._inputs
-    @property
+        return [InputFile(name=i.name, job_id=self._job_id, job_private_key=self._job_private_key) for i in self._get_job_info().inputs]
+    @cached_property
     def outputs(self) -> List[OutputFile]:
         """The output files of the job"""
-        return self._outputs
-    @property
+        return [OutputFile(name=o.name, job_id=self._job_id, job_private_key=self._job_private_key) for o in self._get_job_info().outputs]
+    @cached_property
     def parameters(self) -> List[JobParameter]:
         """The parameters of the job"""
-        return self._parameters
+        return [JobParameter(name=p.name, value=p.value) for p in self._get_job_info().parameters]
+    def _get_job_info(self) -> ProcessorGetJobResponse:
+        return _job_info_manager.get_job_info(job_id=self._job_id, job_private_key=self._job_private_key)
 
 def _get_upload_url_for_output_file(*, name: str, job_id: str, job_private_key: str) -> str:
     """Get a signed upload URL for an output file"""
@@ -1,11 +1,69 @@
 import requests
 import os
 import json
+import time
+import hashlib
 import tempfile
 
+try:
+    # orjson is much faster than the standard library for parsing (potentially large) specs
+    import orjson
+except ImportError:
+    orjson = None # type: ignore
+
+# Specs loaded from remote URIs are cached on disk for a short time so that
+# restarting a compute resource does not need to fetch every spec again.
+# Set DENDRO_DISABLE_SPEC_CACHE=1 to always fetch the specs.
+spec_cache_ttl_sec = 60 * 60
+
 def _load_spec_from_uri(uri: str) -> dict:
+    if not _should_cache_spec(uri):
+        return _load_spec_from_uri_uncached(uri)
+    spec_cache_dir = _get_spec_cache_dir()
+    cache_fname = os.path.join(spec_cache_dir, hashlib.sha256(uri.encode('utf-8')).hexdigest() + '.json')
+    try:
+        if time.time() - os.path.getmtime(cache_fname) < spec_cache_ttl_sec:
+            with open(cache_fname, 'rb') as file:
+                return _json_loads(file.read())
+    except (OSError, ValueError):
+        pass # not cached, expired, or corrupt
+    data = _load_spec_from_uri_uncached(uri)
+    temp_fname = None
+    try:
+        os.makedirs(spec_cache_dir, exist_ok=True)
+        # write to a temporary file and then rename so that a partially written file is never read
+        with tempfile.NamedTemporaryFile(mode='wb', dir=spec_cache_dir, suffix='.tmp', delete=False) as temp_file:
+            temp_fname = temp_file.name
+            # (json rather than orjson, which would write NaN as null)
+            temp_file.write(json.dumps(data).encode('utf-8'))
+        os.replace(temp_fname, cache_fname)
+    except (OSError, TypeError, ValueError) as e:
+        print(f'Warning: unable to cache spec for {uri}: {e}')
+        if temp_fname is not None and os.path.exists(temp_fname):
+            os.remove(temp_fname)
+    return data
+
+def _should_cache_spec(uri: str) -> bool:
+    if uri.startswith('file://'):
+        # no need to cache local files (and they may be changing during development)
+        return False
+    if _is_github_blob_uri(uri):
+        # these are deliberately fetched with a cachebust parameter (see below),
+        # so that a pushed spec change is picked up when the compute resource is restarted
+        return False
+    if os.environ.get('DENDRO_DISABLE_SPEC_CACHE', None) == '1':
+        return False
+    return True
+
+def _get_spec_cache_dir() -> str:
+    return os.path.join(os.path.expanduser('~'), '.dendro', 'spec-cache')
+
+def _is_github_blob_uri(uri: str) -> bool:
+    return uri.startswith('https://github.com/') and ('/blob/' in uri)
+
+def _load_spec_from_uri_uncached(uri: str) -> dict:
     # Convert github blob URL to raw URL
-    if (uri.startswith('https://github.com/')) and ('/blob/' in uri):
+    if _is_github_blob_uri(uri):
         raw_url = uri.replace('github.com', 'raw.githubusercontent.com').replace('/blob/', '/') + f'?cachebust={os.urandom(16).hex()}'
     else:
         raw_url = uri
@@ -20,16 +78,14 @@ def _load_spec_from_uri(uri: str) -> dict:
         response.raise_for_status()
         content = response.text
 
-    # Save to a temporary file
-    with tempfile.NamedTemporaryFile(delete=False, mode='w', suffix='.json') as temp_file:
-        temp_file.write(content)
-        temp_file_path = temp_file.name
-
-    # Read the JSON content from the file
-    with open(temp_file_path, 'r', encoding='utf-8') as file:
-        data = json.load(file)
+    # Parse the JSON content directly (no need for a round trip through a temporary file)
+    return _json_loads(content)
 
-    # Clean up the temporary file
-    os.remove(temp_file_path)
-
-    return data
+def _json_loads(content):
+    if orjson is not None:
+        try:
+            return orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # e.g., NaN or Infinity, which json.dump writes (for float parameter defaults) but orjson rejects
+            pass
+    return json.loads(content)
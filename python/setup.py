@@ -11,6 +11,7 @@ setup(
     description="Web framework for neurophysiology data analysis",
     packages=find_packages(include=['dendro']),
     include_package_data=True,
+    python_requires='>=3.9', # asyncio.to_thread
     install_requires=[
         'click',
         'simplejson',
@@ -23,11 +24,12 @@ setup(
     ],
     extras_require={
         'compute_resource': [
-            'pubnub>=7.2.0'
+            'pubnub>=7.2.0',
+            'orjson'
         ],
         'api': [
             'fastapi',
-            'motor',
+            'pymongo>=4.10',
             'simplejson',
             'pydantic',
             'aiohttp'
@@ -0,0 +1,22 @@
+import pytest
+
+
+@pytest.fixture
+def mock_mongo():
+    # Each pytest-xdist worker is a separate process with its own mock
+    # database, so the cleanup here only affects the current worker.
+    # (imported here because the api packages are not always installed)
+    from dendro.mock import set_use_mock
+    from dendro.api_helpers.clients._get_mongo_client import _clear_mock_mongo_databases
+    set_use_mock(True)
+    try:
+        yield
+    finally:
+        set_use_mock(False)
+        _clear_mock_mongo_databases()
+
+@pytest.fixture(scope='session')
+def github_access_token():
+    # mock tokens stay valid for the lifetime of the process
+    from dendro.api_helpers.routers.gui._authenticate_gui_request import _create_mock_github_access_token
+    return _create_mock_github_access_token()
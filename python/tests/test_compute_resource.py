@@ -1,22 +1,67 @@
+import os
 import shutil
-import tempfile
+import asyncio
+import pytest
 from dendro.compute_resource.register_compute_resource import register_compute_resource
+from dendro.compute_resource.start_compute_resource import Daemon
 
 
-def test_register_compute_resource():
-    with TemporaryDirectory() as tmpdir:
-        register_compute_resource(
-            dir=tmpdir,
-            node_name='test-node'
-        )
+def test_register_compute_resource(tmp_path):
+    register_compute_resource(
+        dir=str(tmp_path),
+        node_name='test-node'
+    )
 
-class TemporaryDirectory:
-    """A context manager for temporary directories"""
+class _FailingSlurmJobHandler:
     def __init__(self):
-        self._dir = None
-    def __enter__(self):
-        self._dir = tempfile.mkdtemp()
-        return self._dir
-    def __exit__(self, exc_type, exc_value, traceback):
-        if self._dir:
-            shutil.rmtree(self._dir)
+        self.num_do_work_calls = 0
+    def is_idle(self):
+        return False
+    def do_work(self):
+        self.num_do_work_calls += 1
+        raise Exception('Problem running slurm batch')
+
+@pytest.mark.asyncio
+async def test_slurm_periodic_survives_do_work_error(monkeypatch):
+    monkeypatch.setenv('COMPUTE_RESOURCE_ID', 'test-compute-resource')
+    monkeypatch.setenv('COMPUTE_RESOURCE_PRIVATE_KEY', 'test-private-key')
+    daemon = Daemon()
+    handler = _FailingSlurmJobHandler()
+    daemon._unique_slurm_job_handlers = [handler] # type: ignore
+
+    task = asyncio.create_task(daemon._slurm_periodic(time_scale_factor=10000))
+    try:
+        await asyncio.sleep(0.05)
+        # the handler keeps getting polled even though every call raises
+        assert not task.done()
+        assert handler.num_do_work_calls > 1
+    finally:
+        task.cancel()
+
+@pytest.mark.asyncio
+async def test_cleanup_old_job_working_directories_survives_rmtree_error(tmp_path, monkeypatch):
+    from dendro.compute_resource.start_compute_resource import _cleanup_old_job_working_directories
+    old_time = 0 # well over 24 hours ago
+    for name in ['job1', 'job2']:
+        (tmp_path / name).mkdir()
+        os.utime(tmp_path / name, (old_time, old_time))
+
+    original_rmtree = shutil.rmtree
+
+    def rmtree(path):
+        if os.path.basename(path) == 'job1':
+            raise PermissionError(f'Cannot remove {path}')
+        original_rmtree(path)
+    monkeypatch.setattr(shutil, 'rmtree', rmtree)
+
+    task = asyncio.create_task(_cleanup_old_job_working_directories(str(tmp_path)))
+    try:
+        for _ in range(100):
+            if not (tmp_path / 'job2').exists():
+                break
+            await asyncio.sleep(0.01)
+        assert not task.done()
+        assert (tmp_path / 'job1').exists()
+        assert not (tmp_path / 'job2').exists()
+    finally:
+        task.cancel()
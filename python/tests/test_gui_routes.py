@@ -0,0 +1,69 @@
+import time
+import pytest
+
+
+# These tests call the route handlers directly (with the mock database), to
+# cover cases that the end-to-end flow in test_integration.py does not. The
+# mock_mongo fixture is defined in conftest.py
+
+@pytest.mark.asyncio
+@pytest.mark.api
+async def test_project_edits_by_other_user(mock_mongo, github_access_token):
+    from fastapi import HTTPException
+    from dendro.api_helpers.routers.gui._authenticate_gui_request import _create_mock_github_access_token
+    from dendro.api_helpers.routers.gui.project_routes import create_project, get_project, set_project_name, set_project_description, delete_project
+    from dendro.api_helpers.routers.gui.project_routes import CreateProjectRequest, SetProjectNameRequest, SetProjectDescriptionRequest
+
+    resp = await create_project(CreateProjectRequest(name='project1'), github_access_token=github_access_token)
+    project_id = resp.projectId
+
+    # a user who is not on the project can neither edit nor delete it
+    github_access_token_for_other_user = _create_mock_github_access_token()
+    with pytest.raises(HTTPException, match='permission'):
+        await set_project_name(project_id, SetProjectNameRequest(name='renamed'), github_access_token=github_access_token_for_other_user)
+    with pytest.raises(HTTPException, match='permission'):
+        await set_project_description(project_id, SetProjectDescriptionRequest(description='changed'), github_access_token=github_access_token_for_other_user)
+    with pytest.raises(HTTPException, match='permission'):
+        await delete_project(project_id, github_access_token=github_access_token_for_other_user)
+
+    resp = await get_project(project_id)
+    assert resp.project.name == 'project1'
+    assert resp.project.description == ''
+
+@pytest.mark.asyncio
+@pytest.mark.api
+async def test_job_dandi_api_key_hidden(mock_mongo):
+    from dendro.common.dendro_types import DendroJob, ComputeResourceSpecProcessor
+    from dendro.api_helpers.clients.db import insert_job
+    from dendro.api_helpers.routers.gui.job_routes import get_job
+
+    # (the jobs in the end-to-end flow are all created without a dandi api key)
+    job = DendroJob(
+        projectId='project1',
+        jobId='job1',
+        jobPrivateKey='job1-private-key',
+        userId='github|user1',
+        processorName='processor1',
+        inputFiles=[],
+        inputFileIds=[],
+        inputParameters=[],
+        outputFiles=[],
+        timestampCreated=time.time(),
+        computeResourceId='compute-resource-1',
+        status='pending',
+        processorSpec=ComputeResourceSpecProcessor(
+            name='processor1',
+            description='',
+            inputs=[],
+            outputs=[],
+            parameters=[],
+            attributes=[],
+            tags=[]
+        ),
+        dandiApiKey='dandi-api-key'
+    )
+    await insert_job(job)
+
+    resp = await get_job('job1')
+    assert resp.job.jobId == 'job1'
+    assert resp.job.dandiApiKey is None # should not be exposed to GUI
@@ -0,0 +1,99 @@
+import os
+import json
+from dendro.sdk import _load_spec_from_uri as lsu
+
+
+class _MockResponse:
+    def __init__(self, text: str):
+        self.text = text
+    def raise_for_status(self):
+        pass
+
+def _mock_requests_get(monkeypatch, spec: dict):
+    requested_urls = []
+
+    def get(url, timeout):
+        requested_urls.append(url)
+        return _MockResponse(json.dumps(spec))
+    monkeypatch.setattr(lsu.requests, 'get', get)
+    return requested_urls
+
+def test_spec_cache_hit(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('DENDRO_DISABLE_SPEC_CACHE', raising=False)
+    requested_urls = _mock_requests_get(monkeypatch, {'name': 'app1'})
+    uri = 'https://example.com/spec.json'
+    assert lsu._load_spec_from_uri(uri) == {'name': 'app1'}
+    assert lsu._load_spec_from_uri(uri) == {'name': 'app1'}
+    assert len(requested_urls) == 1
+    # only the cache file is left in the cache dir (no temporary files)
+    assert len(os.listdir(tmp_path / '.dendro' / 'spec-cache')) == 1
+
+def test_spec_cache_expired(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('DENDRO_DISABLE_SPEC_CACHE', raising=False)
+    requested_urls = _mock_requests_get(monkeypatch, {'name': 'app1'})
+    uri = 'https://example.com/spec.json'
+    lsu._load_spec_from_uri(uri)
+    cache_dir = tmp_path / '.dendro' / 'spec-cache'
+    for fname in os.listdir(cache_dir):
+        old_time = os.path.getmtime(cache_dir / fname) - lsu.spec_cache_ttl_sec - 1
+        os.utime(cache_dir / fname, (old_time, old_time))
+    requested_urls = _mock_requests_get(monkeypatch, {'name': 'app1-updated'})
+    assert lsu._load_spec_from_uri(uri) == {'name': 'app1-updated'}
+    assert len(requested_urls) == 1
+
+def test_spec_cache_bypassed(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('DENDRO_DISABLE_SPEC_CACHE', raising=False)
+
+    # local files
+    spec_fname = tmp_path / 'spec.json'
+    spec_fname.write_text(json.dumps({'name': 'app1'}))
+    assert lsu._load_spec_from_uri(f'file://{spec_fname}') == {'name': 'app1'}
+
+    # github blob urls, which are fetched with a cachebust parameter
+    requested_urls = _mock_requests_get(monkeypatch, {'name': 'app2'})
+    uri = 'https://github.com/user/repo/blob/main/spec.json'
+    lsu._load_spec_from_uri(uri)
+    lsu._load_spec_from_uri(uri)
+    assert len(requested_urls) == 2
+    assert requested_urls[0].startswith('https://raw.githubusercontent.com/user/repo/main/spec.json?cachebust=')
+
+    # everything, when disabled by the environment variable
+    monkeypatch.setenv('DENDRO_DISABLE_SPEC_CACHE', '1')
+    lsu._load_spec_from_uri('https://example.com/spec.json')
+    lsu._load_spec_from_uri('https://example.com/spec.json')
+    assert len(requested_urls) == 4
+
+    assert not (tmp_path / '.dendro').exists()
+
+def test_spec_cache_write_failure(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('DENDRO_DISABLE_SPEC_CACHE', raising=False)
+    _mock_requests_get(monkeypatch, {'name': 'app1'})
+
+    def replace(src, dst):
+        raise OSError('Unable to rename')
+    monkeypatch.setattr(lsu.os, 'replace', replace)
+    # the spec is still returned, and the temporary file is removed
+    assert lsu._load_spec_from_uri('https://example.com/spec.json') == {'name': 'app1'}
+    assert os.listdir(tmp_path / '.dendro' / 'spec-cache') == []
+
+def test_spec_with_nan(tmp_path, monkeypatch):
+    import math
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.delenv('DENDRO_DISABLE_SPEC_CACHE', raising=False)
+    # json.dump writes NaN for float parameter defaults, which is not strictly valid json
+    spec = {'name': 'app1', 'default': float('nan')}
+
+    spec_fname = tmp_path / 'spec.json'
+    spec_fname.write_text(json.dumps(spec))
+    assert math.isnan(lsu._load_spec_from_uri(f'file://{spec_fname}')['default'])
+
+    # also when it comes back from the disk cache
+    requested_urls = _mock_requests_get(monkeypatch, spec)
+    uri = 'https://example.com/spec.json'
+    assert math.isnan(lsu._load_spec_from_uri(uri)['default'])
+    assert math.isnan(lsu._load_spec_from_uri(uri)['default'])
+    assert len(requested_urls) == 1
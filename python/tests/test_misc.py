@@ -87,3 +87,14 @@ def test_get_project_role():
             _check_user_can_edit_project(project, None)
     finally:
         os.environ = old_env
+
+def test_api_request_session_per_thread():
+    import threading
+    from dendro.common._api_request import _get_session
+    session = _get_session()
+    assert _get_session() is session # reused within a thread
+    other_thread_sessions = []
+    thread = threading.Thread(target=lambda: other_thread_sessions.append(_get_session()))
+    thread.start()
+    thread.join()
+    assert other_thread_sessions[0] is not session
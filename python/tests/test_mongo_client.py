@@ -0,0 +1,54 @@
+import asyncio
+import pytest
+
+
+class _FakeMongoClient:
+    def __init__(self):
+        self.closed = False
+    async def close(self):
+        self.closed = True
+
+@pytest.mark.asyncio
+@pytest.mark.api
+async def test_fallback_mongo_client_does_not_set_context(mock_mongo):
+    from dendro.api_helpers.clients._get_mongo_client import _get_mongo_client, _mongo_client_cv
+    client = _get_mongo_client()
+    assert _get_mongo_client() is client
+    # the context var is only set within _mongo_client_scope
+    assert _mongo_client_cv.get() is None
+
+@pytest.mark.asyncio
+@pytest.mark.api
+async def test_replaced_mongo_client_is_closed(monkeypatch):
+    from dendro.api_helpers.clients import _get_mongo_client as gmc
+    old_loop = asyncio.new_event_loop()
+    old_loop.close()
+    old_client = _FakeMongoClient()
+    monkeypatch.setitem(gmc._globals, 'mongo_client', old_client)
+    monkeypatch.setitem(gmc._globals, 'mongo_client_loop', old_loop)
+    monkeypatch.setattr(gmc, '_create_mongo_client', _FakeMongoClient)
+
+    # the loop has changed, so a new client is created and the old one is closed
+    client = gmc._get_mongo_client()
+    assert isinstance(client, _FakeMongoClient)
+    assert client is not old_client
+    for _ in range(10):
+        if old_client.closed:
+            break
+        await asyncio.sleep(0)
+    assert old_client.closed
+    assert not client.closed
+
+@pytest.mark.asyncio
+@pytest.mark.api
+async def test_mongo_client_scope_closes_client(monkeypatch):
+    from dendro.api_helpers.clients import _get_mongo_client as gmc
+    monkeypatch.setitem(gmc._globals, 'mongo_client', None)
+    monkeypatch.setitem(gmc._globals, 'mongo_client_loop', None)
+    monkeypatch.setattr(gmc, '_create_mongo_client', _FakeMongoClient)
+    async with gmc._mongo_client_scope():
+        client = gmc._get_mongo_client()
+        assert isinstance(client, _FakeMongoClient)
+        assert gmc._mongo_client_cv.get() is not None
+    assert client.closed
+    assert gmc._globals['mongo_client'] is None
@@ -1,5 +1,3 @@
-import shutil
-import tempfile
 from dendro import BaseModel, Field
 from dendro.sdk import App, ProcessorBase, InputFile, OutputFile
 from dendro.mock import set_use_mock
@@ -38,16 +36,32 @@ def test_app():
 
         spec = app.get_spec()
         assert spec['name'] == 'test-app'
+        assert len(spec['processors']) == 1
+        assert app.get_spec() is spec # cached
+
+        class Processor2(Processor1):
+            name = 'processor2'
+
+        app.add_processor(Processor2)
+        spec2 = app.get_spec()
+        assert [p['name'] for p in spec2['processors']] == ['processor1', 'processor2']
     finally:
         set_use_mock(False)
 
-class TemporaryDirectory:
-    """A context manager for temporary directories"""
-    def __init__(self):
-        self._dir = None
-    def __enter__(self):
-        self._dir = tempfile.mkdtemp()
-        return self._dir
-    def __exit__(self, exc_type, exc_value, traceback):
-        if self._dir:
-            shutil.rmtree(self._dir)
+def test_processor_run_without_annotation():
+    import pytest
+    from dendro.sdk.AppProcessor import AppProcessor
+
+    class Processor3(ProcessorBase):
+        name = 'processor3'
+        description = 'This is processor 3'
+        label = 'Processor 3'
+        tags = []
+        attributes = {}
+
+        @staticmethod
+        def run(context):
+            pass
+
+    with pytest.raises(Exception, match='needs a type annotation'):
+        AppProcessor.from_processor_class(Processor3)